@@ -1,48 +1,343 @@
 import os
+import numpy as np
 import pandas as pd
 import re
+import sys
 import warnings
 import argparse
+import collections
+import logging
+from concurrent.futures import ProcessPoolExecutor
 
 warnings.filterwarnings("ignore")
 
+log = logging.getLogger(__name__)
+
 PL_SHEETS_TRY_DEFAULT = ["P&L", "P&L by Month"]
 BS_SHEET_DEFAULT = "BS by Month Condensed"
 DB_SHEET_DEFAULT = "DataBase Result"
 
 OUTPUT_DEFAULT = "combined.xlsx"
 MONTHLY_DEFAULT = "monthly.xlsx"
+ENGINE_DEFAULT = "calamine"
+SOURCES_SUFFIX = ".sources.parquet"
 
+_OPENPYXL_READ_KWARGS = {"read_only": True, "data_only": True, "keep_links": False}
+_STREAM_CHUNK_ROWS = 10_000
+_EXCEL_MAX_ROWS = 1_048_576
+_EXCEL_MAX_COLS = 16_384
 
-def _is_worksheet_not_found(err: Exception) -> bool:
-    msg = str(err)
-    return isinstance(err, ValueError) and "Worksheet named" in msg and "not found" in msg
+_YYYY_MM_RE = re.compile(r"^\d{4}-\d{2}$")
 
+_MONTH_NAME_MAP = {
+    "01": "January", "02": "February", "03": "March", "04": "April",
+    "05": "May", "06": "June", "07": "July", "08": "August",
+    "09": "September", "10": "October", "11": "November", "12": "December"
+}
 
-def _available_sheets(file_path: str) -> list[str]:
-    """
-    Lista hojas SOLO para mensajes de error (no afecta lógica).
-    """
-    try:
-        import openpyxl
-        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-        return list(wb.sheetnames)
-    except Exception:
-        return []
+_BANNED_COLS = frozenset({"parent", "category", "total"})
+
+_PARENT_MAP = {
+    "Income": "1 Income",
+    "Cogs": "2 COGS",
+    "Gross Profit": "3 Gross Profit",
+    "Expenses": "5 Expenses",
+    "Net Ordinary Income": "6 Net Ordinary Income",
+    "Other Income": "7 Other Income",
+    "Other Expenses": "8 Other Expenses",
+    "Net Income": "9 Net Income"
+}
+
+_EXCLUDED_PARENTS = frozenset({"3 Gross Profit", "6 Net Ordinary Income", "9 Net Income"})
+
+_TOTAL_PARENT_FILTER = frozenset({
+    "1 Income", "2 COGS", "5 Expenses",
+    "7 Other Income", "8 Other Expenses",
+    "Income", "COGS", "Expenses", "Other Income", "Other Expenses"
+})
+
+_PL_CANONICAL_COLS = ["Parent", "Category", "Amount", "Source", "Date", "Week"]
+_BS_CANONICAL_COLS = ["Category", "Category2", "Last Category", "Amount", "Source", "Date"]
+
+
+def _read_engine_kwargs(engine: str) -> dict:
+    return dict(_OPENPYXL_READ_KWARGS) if engine == "openpyxl" else {}
 
 
 def _err_ctx(source: str, file_path: str) -> str:
     return f"Source={source} | File={file_path}"
 
 
-def _normalize_source_in_combined(s: str) -> str:
-    s = str(s).strip()
-    if "/" in s:
-        return s
-    parts = s.split(".")
-    if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
-        return f"{int(parts[0]):02d}.{parts[1]}"
-    return s
+def _normalize_sources(values: np.ndarray) -> frozenset[str]:
+    """
+    Versión vectorizada de la normalización de Source: los valores sin '/' con forma
+    'M.YYYY' pasan a 'MM.YYYY'; el resto queda igual (solo strip).
+    """
+    arr = np.char.strip(values[pd.notna(values)].astype(str))
+    if arr.size == 0:
+        return frozenset()
+    head, sep, tail = np.char.partition(arr, ".").T
+    fix = (
+        (np.char.find(arr, "/") < 0)
+        & (sep == ".")
+        & np.char.isdigit(head)
+        & np.char.isdigit(tail)
+    )
+    padded = np.char.add(np.char.add(np.char.zfill(np.char.lstrip(head, "0"), 2), "."), tail)
+    return frozenset(pd.unique(np.where(fix, padded, arr).astype(object)).tolist())
+
+
+def process_one(
+    folder_path: str, normalized_source: str, file_date: str, month: str, args: argparse.Namespace
+) -> tuple[pd.DataFrame | None, pd.DataFrame | None, pd.DataFrame | None, list[tuple]]:
+    """
+    Procesa un monthly.xlsx y devuelve (P&L, BS, DB, mensajes).
+    Corre en un proceso aparte: los mensajes se acumulan como (nivel, formato, *args)
+    y main() los emite en orden con logging.
+    """
+    pl_out = bs_out = db_out = None
+    logs = []
+
+    file_path = os.path.join(folder_path, args.monthly)
+    if not os.path.exists(file_path):
+        return pl_out, bs_out, db_out, logs
+
+    try:
+        with pd.ExcelFile(file_path, engine=args.engine, engine_kwargs=_read_engine_kwargs(args.engine)) as xl:
+            sheet_names = xl.sheet_names
+
+            try:
+                pl_sheet_used = next((s for s in args.pl_sheets if s in sheet_names), None)
+
+                if pl_sheet_used is None:
+                    logs.append((
+                        logging.ERROR,
+                        "❌ P&L sheet not found. Tried=%s. Available sheets: %s. %s",
+                        args.pl_sheets, sheet_names, _err_ctx(normalized_source, file_path),
+                    ))
+                else:
+                    pl_df = xl.parse(
+                        pl_sheet_used,
+                        dtype={"Parent": "string", "Category": "string"},
+                        parse_dates=False,
+                    )
+
+                    if "Amount" not in pl_df.columns:
+                        month_expected = _MONTH_NAME_MAP.get(month, "").lower()
+
+                        candidates = [c for c in pl_df.columns if str(c).strip().lower() not in _BANNED_COLS]
+
+                        picked = None
+                        for c in candidates:
+                            if str(c).strip().lower() == month_expected:
+                                picked = c
+                                break
+
+                        if picked is None and len(candidates) == 1:
+                            picked = candidates[0]
+
+                        if picked is None:
+                            raise ValueError(
+                                f"❌ P&L sin 'Amount' y no pude identificar columna del mes. "
+                                f"Esperaba algo como '{_MONTH_NAME_MAP.get(month)}'. Columnas: {list(pl_df.columns)}"
+                            )
+
+                        pl_df["Amount"] = pd.to_numeric(pl_df[picked], errors="coerce")
+
+                        drop_cols = [picked]
+                        if "Total" in pl_df.columns:
+                            drop_cols.append("Total")
+                        pl_df = pl_df.drop(columns=drop_cols, errors="ignore")
+
+                        logs.append((logging.INFO, "ℹ️ Normalized P&L by Month: '%s' -> 'Amount' | Source=%s", picked, normalized_source))
+
+                    if pl_sheet_used != "P&L":
+                        logs.append((logging.INFO, "ℹ️ P&L loaded using sheet '%s'. %s", pl_sheet_used, _err_ctx(normalized_source, file_path)))
+
+                    pl_df["Source"] = normalized_source
+                    file_ts = pd.Timestamp(file_date)
+                    pl_df["Date"] = file_ts
+                    pl_df["Week"] = file_ts.isocalendar().week
+
+                    required_cols = ["Parent", "Category"]
+                    for col in required_cols:
+                        if col not in pl_df.columns:
+                            raise ValueError(f"❌ Columna faltante en P&L: {col} | {_err_ctx(normalized_source, file_path)}")
+
+                    for col in required_cols:
+                        pl_df[col] = pl_df[col].astype("string")
+
+                    mask_total = pl_df["Parent"].notna() & pl_df["Parent"].str.strip().ne("")
+                    pl_df.loc[mask_total, "Category"] = "Total " + pl_df.loc[mask_total, "Category"].fillna("")
+
+                    cols_to_fill = [col for col in pl_df.columns if col not in ["Amount", "Date", "Source"]]
+                    cols_to_fill = [c for c in cols_to_fill if pl_df[c].isna().to_numpy().any()]
+                    if cols_to_fill:
+                        pl_df[cols_to_fill] = pl_df[cols_to_fill].ffill()
+
+                    pl_df["Parent"] = pl_df["Parent"].str.strip().str.title()
+                    pl_df["Parent"] = pl_df["Parent"].astype("category")
+                    # map() sobre un categórico solo recorre las categorías; astype() reconstruye
+                    # el categórico si dos categorías terminan en el mismo nombre.
+                    pl_df["Parent"] = pl_df["Parent"].map(lambda x: _PARENT_MAP.get(x, x), na_action="ignore").astype("category")
+
+                    parent_codes = pl_df["Parent"].cat.codes.to_numpy()
+                    parent_categories = pl_df["Parent"].cat.categories
+                    excluded = np.isin(parent_codes, np.flatnonzero(parent_categories.isin(_EXCLUDED_PARENTS)))
+                    parent_bad = np.isin(parent_codes, np.flatnonzero(parent_categories.isin(_TOTAL_PARENT_FILTER)))
+                    total_bad = pl_df["Category"].str.contains("total", case=False, regex=False, na=False).to_numpy(dtype=bool)
+                    pl_df = pl_df.iloc[~(excluded | (parent_bad & total_bad))]
+
+                    extra_cols = [c for c in pl_df.columns if c not in _PL_CANONICAL_COLS]
+                    pl_out = pl_df.reindex(columns=_PL_CANONICAL_COLS + extra_cols)
+
+            except Exception as e:
+                logs.append((
+                    logging.ERROR,
+                    "❌ Error procesando P&L → Type=%s | Error=%s | %s",
+                    type(e).__name__, str(e), _err_ctx(normalized_source, file_path),
+                ))
+
+            try:
+                if args.bs_sheet not in sheet_names:
+                    logs.append((
+                        logging.WARNING,
+                        "⚠️ Missing sheet '%s'. Available sheets: %s | %s",
+                        args.bs_sheet, sheet_names, _err_ctx(normalized_source, file_path),
+                    ))
+                else:
+                    # Con openpyxl nrows=0 solo lee el encabezado; calamine carga la hoja entera
+                    # igual, así que ahí se parsea una sola vez y se seleccionan las columnas.
+                    bs_full = None if args.engine == "openpyxl" else xl.parse(args.bs_sheet)
+                    bs_columns = xl.parse(args.bs_sheet, nrows=0).columns if bs_full is None else bs_full.columns
+
+                    date_cols = [col for col in bs_columns if isinstance(col, str) and _YYYY_MM_RE.match(col)]
+                    if not date_cols:
+                        raise ValueError("❌ No se encontraron columnas con formato 'yyyy-mm' en BS by Month Condensed.")
+
+                    latest_date_col = max(date_cols)
+                    date_value = latest_date_col + "-01"
+
+                    cols_to_keep = ["Category", "Category2", "Last Category"]
+                    cols_present = [col for col in cols_to_keep if col in bs_columns]
+
+                    if bs_full is None:
+                        bs_df = xl.parse(
+                            args.bs_sheet,
+                            usecols=cols_present + [latest_date_col],
+                            dtype={c: "string" for c in cols_present},
+                        )
+                    else:
+                        bs_df = bs_full[cols_present + [latest_date_col]].astype({c: "string" for c in cols_present})
+                    bs_df = bs_df.rename(columns={latest_date_col: "Amount"})
+                    bs_df["Source"] = normalized_source
+                    bs_df["Date"] = date_value
+
+                    cols_to_fill = [c for c in cols_present if bs_df[c].isna().to_numpy().any()]
+                    if cols_to_fill:
+                        bs_df[cols_to_fill] = bs_df[cols_to_fill].ffill()
+
+                    mask_total = np.zeros(len(bs_df), dtype=bool)
+                    for c in cols_present:
+                        mask_total |= bs_df[c].str.contains("Total", case=False, regex=False, na=False).to_numpy()
+                    bs_df = bs_df[~mask_total]
+
+                    bs_out = bs_df.reindex(columns=_BS_CANONICAL_COLS)
+
+            except Exception as e:
+                logs.append((
+                    logging.WARNING,
+                    "⚠️ Error procesando '%s' → Type=%s | Error=%s | %s",
+                    args.bs_sheet, type(e).__name__, str(e), _err_ctx(normalized_source, file_path),
+                ))
+
+            try:
+                if args.db_sheet not in sheet_names:
+                    logs.append((
+                        logging.WARNING,
+                        "⚠️ Missing sheet '%s'. Available sheets: %s | %s",
+                        args.db_sheet, sheet_names, _err_ctx(normalized_source, file_path),
+                    ))
+                else:
+                    db_df = xl.parse(args.db_sheet)
+                    db_df["Source"] = normalized_source
+
+                    if "Date" in db_df.columns:
+                        db_df["Date"] = pd.to_datetime(db_df["Date"], errors="coerce")
+                        if len(db_df):
+                            wk = db_df["Date"].dt.isocalendar().week.to_numpy(dtype="float64", na_value=np.nan)
+                            wk_missing = np.isnan(wk)
+                            wk_str = np.char.zfill(np.where(wk_missing, 0, wk).astype(int).astype(str), 2)
+                            db_df["Week"] = pd.array(np.where(wk_missing, None, wk_str), dtype="string")
+                        else:
+                            db_df["Week"] = pd.array([], dtype="string")
+                    else:
+                        db_df["Date"] = pd.NaT
+                        db_df["Week"] = pd.NA
+
+                    if "Parent" in db_df.columns:
+                        db_df = db_df[~db_df["Parent"].isin(_EXCLUDED_PARENTS)]
+
+                    db_out = db_df
+
+            except Exception as e:
+                logs.append((
+                    logging.WARNING,
+                    "⚠️ Error procesando '%s' → Type=%s | Error=%s | %s",
+                    args.db_sheet, type(e).__name__, str(e), _err_ctx(normalized_source, file_path),
+                ))
+
+    except Exception as e:
+        logs.append((
+            logging.ERROR,
+            "❌ Error reading file → Type=%s | Error=%s | %s",
+            type(e).__name__, str(e), _err_ctx(normalized_source, file_path),
+        ))
+
+    return pl_out, bs_out, db_out, logs
+
+
+def _load_sources_checkpoint(sources_file: str, output_file: str) -> frozenset[str] | None:
+    """
+    Lee los Source ya combinados desde el parquet auxiliar, si es más reciente que output_file.
+    Devuelve None si no existe, está desactualizado o no se pudo leer.
+    """
+    if not os.path.exists(sources_file) or os.path.getmtime(sources_file) < os.path.getmtime(output_file):
+        return None
+    try:
+        return frozenset(pd.read_parquet(sources_file, columns=["Source"])["Source"].dropna())
+    except Exception:
+        return None
+
+
+def _write_sheet_streaming(writer: pd.ExcelWriter, df: pd.DataFrame, sheet_name: str) -> None:
+    """
+    Escribe df fila por fila. constant_memory de xlsxwriter solo acepta filas en orden
+    y DataFrame.to_excel escribe columna por columna, así que no se puede usar aquí.
+    Convierte de a _STREAM_CHUNK_ROWS filas para no duplicar el frame completo en memoria;
+    los NA quedan vacíos y ±inf se escriben como "inf"/"-inf", igual que to_excel.
+    """
+    n_rows, n_cols = len(df) + 1, len(df.columns)
+    if n_rows > _EXCEL_MAX_ROWS or n_cols > _EXCEL_MAX_COLS:
+        raise ValueError(
+            f"This sheet is too large! Your sheet size is: {n_rows}, {n_cols} "
+            f"Max sheet size is: {_EXCEL_MAX_ROWS}, {_EXCEL_MAX_COLS} | Sheet={sheet_name}"
+        )
+
+    ws = writer.book.add_worksheet(sheet_name)
+    ws.write_row(0, 0, [str(c) for c in df.columns])
+    numeric_cols = [j for j, dtype in enumerate(df.dtypes) if pd.api.types.is_float_dtype(dtype)]
+
+    for start in range(0, len(df), _STREAM_CHUNK_ROWS):
+        part = df.iloc[start:start + _STREAM_CHUNK_ROWS]
+        values = part.astype(object).where(part.notna().to_numpy(), None)
+        for j in numeric_cols:
+            num = part.iloc[:, j].to_numpy(dtype="float64", na_value=np.nan)
+            inf_rows = np.flatnonzero(np.isinf(num))
+            if inf_rows.size:
+                values.iloc[inf_rows, j] = np.where(num[inf_rows] > 0, "inf", "-inf")
+        for r, row in enumerate(values.itertuples(index=False, name=None), start=start + 1):
+            ws.write_row(r, 0, row)
 
 
 def parse_args():
@@ -53,257 +348,115 @@ def parse_args():
     p.add_argument("--pl-sheets", nargs="*", default=PL_SHEETS_TRY_DEFAULT)
     p.add_argument("--bs-sheet", default=BS_SHEET_DEFAULT)
     p.add_argument("--db-sheet", default=DB_SHEET_DEFAULT)
+    p.add_argument("--engine", default=ENGINE_DEFAULT, choices=["calamine", "openpyxl"])
+    p.add_argument("--quiet", "-q", action="store_true")
     return p.parse_args()
 
 
 def main():
     args = parse_args()
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format="%(message)s", stream=sys.stdout)
 
     current_dir = os.path.dirname(os.path.abspath(__file__))
     base_dir = os.path.abspath(args.base_dir) if args.base_dir else current_dir
 
     output_file = os.path.join(base_dir, args.output)
+    sources_file = output_file + SOURCES_SUFFIX
     pl_data = []
     bs_data = []
     db_data = []
-    existing_sources = set()
+    existing_sources = frozenset()
+    tasks = []
+
+    cached_sources = _load_sources_checkpoint(sources_file, output_file) if os.path.exists(output_file) else None
 
-    if os.path.exists(output_file):
+    if cached_sources is not None:
+        existing_sources = cached_sources
+        log.info("✅ Loaded %d sources from '%s'.", len(existing_sources), sources_file)
+    elif os.path.exists(output_file):
         try:
-            existing_df = pd.read_excel(output_file, sheet_name="P&L Combined", engine="openpyxl")
+            existing_df = pd.read_excel(
+                output_file, sheet_name="P&L Combined", engine=args.engine, engine_kwargs=_read_engine_kwargs(args.engine)
+            )
             if "Source" in existing_df.columns:
-                existing_df["Source"] = existing_df["Source"].astype(str).apply(_normalize_source_in_combined)
-                existing_sources = set(existing_df["Source"].dropna().unique())
-                print(f"✅ Loaded existing P&L Combined with {len(existing_sources)} sources.")
+                existing_sources = _normalize_sources(existing_df["Source"].to_numpy(dtype=object, na_value=None))
+                log.info("✅ Loaded existing P&L Combined with %d sources.", len(existing_sources))
             else:
-                print("⚠️ Existing 'P&L Combined' found but column 'Source' is missing; duplicates may occur.")
+                log.warning("⚠️ Existing 'P&L Combined' found but column 'Source' is missing; duplicates may occur.")
         except Exception as e:
-            print(f"❌ Failed to read existing file '{output_file}' (sheet 'P&L Combined'). "
-                  f"Type={type(e).__name__} | Error={e}")
-
-    for year_folder in os.listdir(base_dir):
-        year_path = os.path.join(base_dir, year_folder)
-        if os.path.isdir(year_path) and year_folder.isdigit():
-            for folder_name in os.listdir(year_path):
-                folder_path = os.path.join(year_path, folder_name)
-                if os.path.isdir(folder_path) and '.' in folder_name:
-                    parts = folder_name.strip().split(".")
-                    if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
-                        month = f"{int(parts[0]):02d}"
-                        year = parts[1]
-                        normalized_source = f"{year_folder}/{month}.{year}"
-                        file_date = f"{year}-{month}-01"
-
-                        if normalized_source in existing_sources:
-                            continue
-
-                        file_path = os.path.join(folder_path, args.monthly)
-                        if os.path.exists(file_path):
-                            try:
-                                try:
-                                    pl_df = None
-                                    pl_sheet_used = None
-
-                                    for sheet_try in args.pl_sheets:
-                                        try:
-                                            pl_df = pd.read_excel(file_path, sheet_name=sheet_try, engine="openpyxl")
-                                            pl_sheet_used = sheet_try
-                                            break
-                                        except Exception as e:
-                                            if _is_worksheet_not_found(e):
-                                                continue
-                                            raise
-                                        
-                                    if pl_df is not None and "Amount" not in pl_df.columns:
-                                        month_name_map = {
-                                            "01": "January", "02": "February", "03": "March", "04": "April",
-                                            "05": "May", "06": "June", "07": "July", "08": "August",
-                                            "09": "September", "10": "October", "11": "November", "12": "December"
-                                        }
-
-                                        month_expected = month_name_map.get(month, "").lower()
-
-                                        banned = {"parent", "category", "total"}
-                                        candidates = [c for c in pl_df.columns if str(c).strip().lower() not in banned]
-
-                                        picked = None
-                                        for c in candidates:
-                                            if str(c).strip().lower() == month_expected:
-                                                picked = c
-                                                break
-
-                                        if picked is None and len(candidates) == 1:
-                                            picked = candidates[0]
-
-                                        if picked is None:
-                                            raise ValueError(
-                                                f"❌ P&L sin 'Amount' y no pude identificar columna del mes. "
-                                                f"Esperaba algo como '{month_name_map.get(month)}'. Columnas: {list(pl_df.columns)}"
-                                            )
-
-                                        pl_df["Amount"] = pd.to_numeric(pl_df[picked], errors="coerce")
-
-                                        drop_cols = [picked]
-                                        if "Total" in pl_df.columns:
-                                            drop_cols.append("Total")
-                                        pl_df = pl_df.drop(columns=drop_cols, errors="ignore")
-
-                                        print(f"ℹ️ Normalized P&L by Month: '{picked}' -> 'Amount' | Source={normalized_source}")
-                                    
-
-                                    if pl_df is None:
-                                        sheets = _available_sheets(file_path)
-                                        sheets_msg = f"Available sheets: {sheets}" if sheets else "Available sheets: (could not read)"
-                                        print(
-                                            "❌ P&L sheet not found. "
-                                            f"Tried={args.pl_sheets}. {sheets_msg}. "
-                                            f"{_err_ctx(normalized_source, file_path)}"
-                                        )
-                                    else:
-                                        if pl_sheet_used != "P&L":
-                                            print(f"ℹ️ P&L loaded using sheet '{pl_sheet_used}'. {_err_ctx(normalized_source, file_path)}")
-
-                                        pl_df["Source"] = normalized_source
-                                        pl_df["Date"] = pd.to_datetime(file_date)
-                                        pl_df["Week"] = pl_df["Date"].dt.isocalendar().week
-
-                                        required_cols = ["Parent", "Category"]
-                                        for col in required_cols:
-                                            if col not in pl_df.columns:
-                                                raise ValueError(f"❌ Columna faltante en P&L: {col} | {_err_ctx(normalized_source, file_path)}")
-
-                                        mask_total = pl_df["Parent"].notna() & pl_df["Parent"].astype(str).str.strip().ne("")
-                                        pl_df.loc[mask_total, "Category"] = "Total " + pl_df.loc[mask_total, "Category"].astype(str)
-
-                                        cols_to_fill = [col for col in pl_df.columns if col not in ["Amount", "Date", "Source"]]
-                                        pl_df[cols_to_fill] = pl_df[cols_to_fill].fillna(method="ffill")
-
-                                        pl_df["Parent"] = pl_df["Parent"].astype(str).str.strip().str.title()
-                                        parent_map = {
-                                            "Income": "1 Income",
-                                            "Cogs": "2 COGS",
-                                            "Gross Profit": "3 Gross Profit",
-                                            "Expenses": "5 Expenses",
-                                            "Net Ordinary Income": "6 Net Ordinary Income",
-                                            "Other Income": "7 Other Income",
-                                            "Other Expenses": "8 Other Expenses",
-                                            "Net Income": "9 Net Income"
-                                        }
-                                        pl_df["Parent"] = pl_df["Parent"].replace(parent_map)
-
-                                        pl_df = pl_df[~pl_df["Parent"].isin(["3 Gross Profit", "6 Net Ordinary Income", "9 Net Income"])]
-
-                                        total_mask = pl_df["Category"].astype(str).str.contains("Total", case=False)
-                                        parent_filter = pl_df["Parent"].isin([
-                                            "1 Income", "2 COGS", "5 Expenses",
-                                            "7 Other Income", "8 Other Expenses",
-                                            "Income", "COGS", "Expenses", "Other Income", "Other Expenses"
-                                        ])
-                                        final_mask = ~(total_mask & parent_filter)
-                                        pl_df = pl_df[final_mask]
-
-                                        pl_data.append(pl_df)
-
-                                except Exception as e:
-                                    sheets = _available_sheets(file_path) if _is_worksheet_not_found(e) else []
-                                    sheets_msg = f" | Available sheets: {sheets}" if sheets else ""
-                                    print(
-                                        f"❌ Error procesando P&L → Type={type(e).__name__} | Error={e}"
-                                        f"{sheets_msg} | {_err_ctx(normalized_source, file_path)}"
-                                    )
-
-                                try:
-                                    bs_df_raw = pd.read_excel(file_path, sheet_name=args.bs_sheet, engine="openpyxl")
-
-                                    date_cols = [col for col in bs_df_raw.columns if isinstance(col, str) and re.match(r"^\d{4}-\d{2}$", col)]
-                                    if not date_cols:
-                                        raise ValueError("❌ No se encontraron columnas con formato 'yyyy-mm' en BS by Month Condensed.")
-
-                                    latest_date_col = sorted(date_cols)[-1]
-                                    date_value = latest_date_col + "-01"
-
-                                    cols_to_keep = ["Category", "Category2", "Last Category"]
-                                    cols_present = [col for col in cols_to_keep if col in bs_df_raw.columns]
-
-                                    bs_df = bs_df_raw[cols_present + [latest_date_col]].copy()
-                                    bs_df = bs_df.rename(columns={latest_date_col: "Amount"})
-                                    bs_df["Source"] = normalized_source
-                                    bs_df["Date"] = date_value
-
-                                    for col in cols_present:
-                                        bs_df[col] = bs_df[col].fillna(method="ffill")
-
-                                    mask_total = bs_df[cols_present].astype(str).apply(lambda x: x.str.contains("Total", case=False, na=False)).any(axis=1)
-                                    bs_df = bs_df[~mask_total]
-
-                                    bs_data.append(bs_df)
-
-                                except Exception as e:
-                                    if _is_worksheet_not_found(e):
-                                        sheets = _available_sheets(file_path)
-                                        print(
-                                            f"⚠️ Missing sheet '{args.bs_sheet}'. "
-                                            f"Available sheets: {sheets if sheets else '(could not read)'} | "
-                                            f"{_err_ctx(normalized_source, file_path)}"
-                                        )
-                                    else:
-                                        print(
-                                            f"⚠️ Error procesando '{args.bs_sheet}' → Type={type(e).__name__} | Error={e} | "
-                                            f"{_err_ctx(normalized_source, file_path)}"
-                                        )
-
-                                try:
-                                    db_df = pd.read_excel(file_path, sheet_name=args.db_sheet, engine="openpyxl")
-                                    db_df["Source"] = normalized_source
-
-                                    if "Date" in db_df.columns:
-                                        db_df["Date"] = pd.to_datetime(db_df["Date"], errors="coerce")
-                                        db_df["Week"] = db_df["Date"].dt.isocalendar().week.astype("Int64").astype(str).str.zfill(2)
-                                    else:
-                                        db_df["Date"] = pd.NaT
-                                        db_df["Week"] = pd.NA
-
-                                    if "Parent" in db_df.columns:
-                                        db_df = db_df[~db_df["Parent"].isin(["3 Gross Profit", "6 Net Ordinary Income", "9 Net Income"])]
-
-                                    db_data.append(db_df)
-
-                                except Exception as e:
-                                    if _is_worksheet_not_found(e):
-                                        sheets = _available_sheets(file_path)
-                                        print(
-                                            f"⚠️ Missing sheet '{args.db_sheet}'. "
-                                            f"Available sheets: {sheets if sheets else '(could not read)'} | "
-                                            f"{_err_ctx(normalized_source, file_path)}"
-                                        )
-                                    else:
-                                        print(
-                                            f"⚠️ Error procesando '{args.db_sheet}' → Type={type(e).__name__} | Error={e} | "
-                                            f"{_err_ctx(normalized_source, file_path)}"
-                                        )
-
-                            except Exception as e:
-                                print(
-                                    f"❌ Error reading file → Type={type(e).__name__} | Error={e} | "
-                                    f"{_err_ctx(normalized_source, file_path)}"
-                                )
+            log.error("❌ Failed to read existing file '%s' (sheet 'P&L Combined'). Type=%s | Error=%s",
+                      output_file, type(e).__name__, e)
+
+    existing_by_year = collections.defaultdict(set)
+    for src in existing_sources:
+        if "/" in src:
+            year_folder, month_folder = src.split("/", 1)
+            existing_by_year[year_folder].add(month_folder)
+
+    with os.scandir(base_dir) as year_entries:
+        for ye in year_entries:
+            if ye.is_dir() and ye.name.isdigit():
+                # Asume que YYYY/ solo contiene carpetas MM.YYYY del mismo año (ver README).
+                if {f"{m:02d}.{ye.name}" for m in range(1, 13)} <= existing_by_year[ye.name]:
+                    continue
+                with os.scandir(ye.path) as month_entries:
+                    for me in month_entries:
+                        if me.is_dir() and '.' in me.name:
+                            parts = me.name.strip().split(".")
+                            if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+                                month = f"{int(parts[0]):02d}"
+                                year = parts[1]
+                                normalized_source = f"{ye.name}/{month}.{year}"
+                                file_date = f"{year}-{month}-01"
+
+                                if normalized_source in existing_sources:
+                                    continue
+
+                                tasks.append((me.path, normalized_source, file_date, month, args))
+
+    if tasks:
+        with ProcessPoolExecutor() as ex:
+            for pl_df, bs_df, db_df, logs in ex.map(process_one, *zip(*tasks)):
+                for level, msg, *msg_args in logs:
+                    log.log(level, msg, *msg_args)
+                if pl_df is not None:
+                    pl_data.append(pl_df)
+                if bs_df is not None:
+                    bs_data.append(bs_df)
+                if db_df is not None:
+                    db_data.append(db_df)
 
     if pl_data or bs_data or db_data:
-        with pd.ExcelWriter(output_file, engine="openpyxl", mode="w") as writer:
+        with pd.ExcelWriter(
+            output_file,
+            engine="xlsxwriter",
+            engine_kwargs={"options": {
+                "constant_memory": True,
+                "default_date_format": "yyyy-mm-dd",
+                "nan_inf_to_errors": True,
+            }},
+        ) as writer:
             if pl_data:
-                pl_combined = pd.concat(pl_data, ignore_index=True)
-                pl_combined.to_excel(writer, sheet_name="P&L Combined", index=False)
-                print(f"📄 P&L Combined guardado con {len(pl_combined)} registros.")
+                pl_combined = pd.concat(pl_data, ignore_index=True, copy=False, sort=False)
+                _write_sheet_streaming(writer, pl_combined, "P&L Combined")
+                log.info("📄 P&L Combined guardado con %d registros.", len(pl_combined))
             if bs_data:
-                bs_combined = pd.concat(bs_data, ignore_index=True)
-                bs_combined.to_excel(writer, sheet_name="BS Condensed Combined", index=False)
-                print(f"📄 BS Condensed Combined guardado con {len(bs_combined)} registros.")
+                bs_combined = pd.concat(bs_data, ignore_index=True, copy=False, sort=False)
+                _write_sheet_streaming(writer, bs_combined, "BS Condensed Combined")
+                log.info("📄 BS Condensed Combined guardado con %d registros.", len(bs_combined))
             if db_data:
-                db_combined = pd.concat(db_data, ignore_index=True)
-                db_combined.to_excel(writer, sheet_name="DataBase Combined", index=False)
-                print(f"📄 DataBase Combined guardado con {len(db_combined)} registros.")
+                db_combined = pd.concat(db_data, ignore_index=True, copy=False, sort=False)
+                _write_sheet_streaming(writer, db_combined, "DataBase Combined")
+                log.info("📄 DataBase Combined guardado con %d registros.", len(db_combined))
+
+        if pl_data:
+            try:
+                pl_combined[["Source"]].drop_duplicates().to_parquet(sources_file, index=False)
+            except Exception as e:
+                log.warning("⚠️ Could not write sources checkpoint '%s'. Type=%s | Error=%s",
+                            sources_file, type(e).__name__, e)
     else:
-        print("ℹ️ No hay datos nuevos para agregar.")
+        log.info("ℹ️ No hay datos nuevos para agregar.")
 
 
 if __name__ == "__main__":